@@ -52,98 +52,72 @@ import os
 import re
 import sys
 
-gitRef = os.getenv("GITHUB_REF")
-
 # From https://semver.org/#is-there-a-suggested-regular-expression-regex-to-check-a-semver-string
 # Group 'version' returns the whole version
 # other named groups return the components
-tagRefRegex = r"^refs/tags/v(?P<version>0|(?P<major>0|[1-9]\d*)\.(?P<minor>0|[1-9]\d*)\.(?P<patch>0|[1-9]\d*)(?:-(?P<prerelease>(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?(?:\+(?P<buildmetadata>[0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?)$"
-pullRefRegex = r"^refs/pull/(.*)/(.*)$"
+# The patterns are unanchored because they are always applied with fullmatch().
+tagRefRegex = r"refs/tags/v(?P<version>0|(?P<major>0|[1-9]\d*)\.(?P<minor>0|[1-9]\d*)\.(?P<patch>0|[1-9]\d*)(?:-(?P<prerelease>(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?(?:\+(?P<buildmetadata>[0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?)"
+pullRefRegex = r"refs/pull/(.*)/(.*)"
+
+TAG_RE = re.compile(tagRefRegex)
+PULL_RE = re.compile(pullRefRegex)
 
-with open(os.getenv("GITHUB_ENV"), "a") as githubEnv:
+def getReleaseEnv(gitRef):
+    # Returns the (name, value) pairs to set for the given Git ref.
     if gitRef is None:
         print("This is not running in github, GITHUB_REF is null. Assuming a local build...")
+        return [
+            ("REL_VERSION", "edge"),
+            ("CHART_VERSION", "0.42.42-dev"),
+            ("REL_CHANNEL", "edge"),
+        ]
 
-        version = "REL_VERSION=edge"
-        print("Setting: {}".format(version))
-        githubEnv.write(version + "\n")
-
-        chart = "CHART_VERSION=0.42.42-dev"
-        print("Setting: {}".format(chart))
-        githubEnv.write(chart + "\n")
-
-        channel = "REL_CHANNEL=edge"
-        print("Setting: {}".format(channel))
-        githubEnv.write(channel + "\n")
-
-        sys.exit(0)
-
-    match = re.search(pullRefRegex, gitRef)
+    match = PULL_RE.fullmatch(gitRef)
     if match is not None:
         print("This is pull request {}...".format(match.group(1)))
+        return [
+            ("REL_VERSION", "pr-{}".format(match.group(1))),
+            ("CHART_VERSION", "0.42.42-pr-{}".format(match.group(1))),
+            ("REL_CHANNEL", "edge"),
+        ]
 
-        version = "REL_VERSION=pr-{}".format(match.group(1))
-        print("Setting: {}".format(version))
-        githubEnv.write(version + "\n")
-
-        chart = "CHART_VERSION=0.42.42-pr-{}".format(match.group(1))
-        print("Setting: {}".format(chart))
-        githubEnv.write(chart + "\n")
-
-        channel = "REL_CHANNEL=edge"
-        print("Setting: {}".format(channel))
-        githubEnv.write(channel + "\n")
-
-        sys.exit(0)
-
-    match = re.search(tagRefRegex, gitRef)
+    match = TAG_RE.fullmatch(gitRef)
     if match is not None:
         print("This is tagged as {}...".format(match.group("version")))
 
         if match.group("prerelease") is None:
             print("This is a full release...")
-
-            version = "REL_VERSION={}".format(match.group("version"))
-            print("Setting: {}".format(version))
-            githubEnv.write(version + "\n")
-
-            chart = "CHART_VERSION={}".format(match.group("version"))
-            print("Setting: {}".format(chart))
-            githubEnv.write(chart + "\n")
-
-            channel = "REL_CHANNEL={}.{}".format(match.group("major"), match.group("minor"))
-            print("Setting: {}".format(channel))
-            githubEnv.write(channel + "\n")
-
-            print("Setting: UPDATE_RELEASE=true")
-            githubEnv.write("UPDATE_RELEASE=true" + "\n")
-            sys.exit(0)
-
-        else:
-            print("This is a prerelease...")
-        
-            version = "REL_VERSION={}".format(match.group("version"))
-            print("Setting: {}".format(version))
-            githubEnv.write(version + "\n")
-
-            chart = "CHART_VERSION={}".format(match.group("version"))
-            print("Setting: {}".format(chart))
-            githubEnv.write(chart + "\n")
-
-            channel = "REL_CHANNEL={}".format(match.group("version"))
-            print("Setting: {}".format(channel))
-            githubEnv.write(channel + "\n")
-            sys.exit(0)
+            return [
+                ("REL_VERSION", match.group("version")),
+                ("CHART_VERSION", match.group("version")),
+                ("REL_CHANNEL", "{}.{}".format(match.group("major"), match.group("minor"))),
+                ("UPDATE_RELEASE", "true"),
+            ]
+
+        print("This is a prerelease...")
+        return [
+            ("REL_VERSION", match.group("version")),
+            ("CHART_VERSION", match.group("version")),
+            ("REL_CHANNEL", match.group("version")),
+        ]
 
     print("This is a normal build")
-    version = "REL_VERSION=edge"
-    print("Setting: {}".format(version))
-    githubEnv.write(version + "\n")
-
-    chart = "CHART_VERSION=0.42.42-dev"
-    print("Setting: {}".format(chart))
-    githubEnv.write(chart + "\n")
-
-    channel = "REL_CHANNEL=edge"
-    print("Setting: {}".format(channel))
-    githubEnv.write(channel + "\n")
+    return [
+        ("REL_VERSION", "edge"),
+        ("CHART_VERSION", "0.42.42-dev"),
+        ("REL_CHANNEL", "edge"),
+    ]
+
+def writeEnv(githubEnv, pairs):
+    # GITHUB_ENV is line-delimited, so all of the variables are emitted with a single write.
+    lines = ["{}={}\n".format(key, value) for key, value in pairs]
+    sys.stdout.write("".join("Setting: " + line for line in lines))
+    githubEnv.write("".join(lines))
+
+def main():
+    pairs = getReleaseEnv(os.getenv("GITHUB_REF"))
+    with open(os.getenv("GITHUB_ENV"), "a") as githubEnv:
+        writeEnv(githubEnv, pairs)
+
+if __name__ == "__main__":
+    main()
@@ -22,8 +22,9 @@ import os
 import sys
 import tempfile
 import contextlib
-import shutil
 import subprocess
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 
 if len(sys.argv) != 4:
     print("Usage: publish-test-terraform-recipes.py <recipe root> <namespace> <config map name>")
@@ -32,6 +33,23 @@ recipe_root = sys.argv[1]
 namespace = sys.argv[2]
 config_map_name = sys.argv[3]
 
+def zip_recipe(recipe_dir, tmp_dir):
+    # Equivalent to shutil.make_archive(..., 'zip', recipe_dir). Before Python 3.10.6 make_archive
+    # changes the working directory, so it can't be used to zip recipes concurrently. zlib releases
+    # the GIL while compressing.
+    output_filename = os.path.join(tmp_dir, os.path.basename(recipe_dir) + ".zip")
+    with zipfile.ZipFile(output_filename, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for root, dirs, files in os.walk(recipe_dir):
+            for name in sorted(dirs):
+                path = os.path.join(root, name)
+                zf.write(path, os.path.relpath(path, recipe_dir))
+            for name in sorted(files):
+                # Like make_archive, skip anything that isn't a regular file (e.g. broken symlinks).
+                path = os.path.join(root, name)
+                if os.path.isfile(path):
+                    zf.write(path, os.path.relpath(path, recipe_dir))
+    return output_filename
+
 # Write output to stdout all of the time, and the step summary if we're in Github Actions.
 step_summary = os.getenv("GITHUB_STEP_SUMMARY")
 with open(step_summary, "a") if step_summary else contextlib.suppress() as output:
@@ -56,15 +74,15 @@ with open(step_summary, "a") if step_summary else contextlib.suppress() as outpu
     # Use a temporary directory as scratch space. We need to zip each recipe, and want to clean
     # up after ourselves.
     with tempfile.TemporaryDirectory() as tmp_dir:
-        for recipe_dir in recipe_dirs:
-            log("Processing recipe: " + recipe_dir)
-
-            # Make the zip.
-            output_filename = shutil.make_archive(os.path.join(tmp_dir, os.path.basename(recipe_dir)), 'zip', recipe_dir)
-            log("Created zip file: " + output_filename)
+        # Recipes are independent, so zip them in parallel.
+        with ThreadPoolExecutor() as pool:
+            output_filenames = pool.map(lambda recipe_dir: zip_recipe(recipe_dir, tmp_dir), recipe_dirs)
+            for recipe_dir, output_filename in zip(recipe_dirs, output_filenames):
+                log("Processed recipe: " + recipe_dir)
+                log("Created zip file: " + output_filename)
 
-            # Add to config entries
-            config_entries[os.path.basename(recipe_dir)] = output_filename
+                # Add to config entries
+                config_entries[os.path.basename(recipe_dir)] = output_filename
 
         # Delete the configmap if it already exists
         args = ["kubectl", "delete", "configmap", config_map_name, "--namespace", namespace, "--ignore-not-found=true"]
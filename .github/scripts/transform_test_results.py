@@ -18,30 +18,22 @@
 # that can be used by the github actions junit reporter
 # Path: .github/scripts/transform-test-results.py
 
+import os
 import re
 import sys
 import xml.etree.ElementTree
 
-def main():
-    if len(sys.argv) != 4:
-        print("Usage: transform-test-results.py <repository root> <input file> <output file>")
-        sys.exit(1)
-
-    repository_root = sys.argv[1]
-    input_file = sys.argv[2]
-    output_file = sys.argv[3]
+# Matches the location of a testify failure, it will look like \tError Trace:\tfilename:line
+ERROR_TRACE_RE = re.compile(r"\tError Trace:\t([^\t\n]+):(\d+)")
 
-    print(f"Processing {input_file}")
-    pattern = re.compile(r"\tError Trace:\t(.*):(\d+)")
-    et = xml.etree.ElementTree.parse(input_file)
-    for testcase in et.findall('./testsuite/testcase'):
+def transform_testsuite(testsuite, repository_prefix):
+    for testcase in testsuite.findall('./testcase'):
         failure = testcase.find('./failure')
-        if failure is None:
+        if failure is None or not failure.text or "Error Trace:" not in failure.text:
             continue
         
         # Extract file name by matching regex pattern in the text
-        # it will look like \tError Trace:\tfilename:line
-        match = pattern.search(failure.text)
+        match = ERROR_TRACE_RE.search(failure.text)
         if match is None:
             continue
 
@@ -50,21 +42,97 @@ def main():
 
         # The filename will contain the fully-qualified path, and we need to turn that into
         # a relative path from the repository root
-        if not file.startswith(repository_root):
+        if not file.startswith(repository_prefix):
             print(f"Could not find repository name in file path: {file}")
             continue
 
-        file = file[len(repository_root) + 1:]
+        file = file[len(repository_prefix):]
         
         testcase.attrib["file"] = file
         testcase.attrib["line"] = line
         failure.attrib["file"] = file
         failure.attrib["line"] = line
 
-    
-    # Write back to file
+def start_tag(root):
+    # Serialize the root element (including its leading text) without any of its children.
+    shell = xml.etree.ElementTree.Element(root.tag, root.attrib)
+    shell.text = root.text
+    serialized = xml.etree.ElementTree.tostring(shell, short_empty_elements=False)
+    return serialized[:serialized.rindex(b"</")]
+
+def main():
+    if len(sys.argv) != 4:
+        print("Usage: transform-test-results.py <repository root> <input file> <output file>")
+        sys.exit(1)
+
+    repository_root = sys.argv[1]
+    input_file = sys.argv[2]
+    output_file = sys.argv[3]
+
+    # The repository root, including the trailing separator, that is stripped from file paths
+    repository_prefix = repository_root.rstrip(os.sep) + os.sep
+
+    print(f"Processing {input_file}")
+
+    # Stream the input rather than parsing the whole document. Each testsuite is transformed
+    # and written once it has been parsed, and is then dropped from the tree, so at most two
+    # testsuites are held in memory at a time.
+    #
+    # The output is written to a temporary file and only moved into place once the whole input
+    # has been parsed, so a malformed input never leaves a partial report behind.
     print(f"Writing {output_file}")
-    et.write(output_file)
+    temp_file = output_file + ".tmp"
+    with open(temp_file, "wb") as output:
+        try:
+            transform(input_file, output, repository_prefix)
+        except BaseException:
+            output.close()
+            os.remove(temp_file)
+            raise
+
+    os.replace(temp_file, output_file)
+
+def transform(input_file, output, repository_prefix):
+    root = None
+    depth = 0
+    wrote_start_tag = False
+
+    # A top-level element is written only when the next one starts (or the root ends). Until then
+    # iterparse may not have seen the whitespace that follows it, and its tail would be incomplete.
+    pending = None
+
+    def write_pending():
+        nonlocal wrote_start_tag
+        if not wrote_start_tag:
+            output.write(start_tag(root))
+            wrote_start_tag = True
+
+        output.write(xml.etree.ElementTree.tostring(pending))
+        root.remove(pending)
+
+    for event, elem in xml.etree.ElementTree.iterparse(input_file, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = elem
+            elif depth == 1 and pending is not None:
+                write_pending()
+                pending = None
+            depth += 1
+            continue
+
+        depth -= 1
+        if depth == 1:
+            if elem.tag == "testsuite":
+                transform_testsuite(elem, repository_prefix)
+            pending = elem
+        elif depth == 0 and pending is not None:
+            write_pending()
+
+    if wrote_start_tag:
+        output.write(f"</{root.tag}>".encode())
+    else:
+        # The root has no children, so it can be written as-is.
+        output.write(xml.etree.ElementTree.tostring(root))
 
 if __name__ == "__main__":
     main()
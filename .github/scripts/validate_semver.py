@@ -20,18 +20,19 @@ import os
 import re
 import sys
 
+# From https://semver.org/#is-there-a-suggested-regular-expression-regex-to-check-a-semver-string
+# The anchors are omitted because the pattern is always applied with fullmatch().
+SEMVER_REGEX = r"(?P<major>0|[1-9]\d*)\.(?P<minor>0|[1-9]\d*)\.(?P<patch>0|[1-9]\d*)(?:-(?P<prerelease>(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?(?:\+(?P<buildmetadata>[0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?"
+
+SEMVER_RE = re.compile(SEMVER_REGEX)
+
 def main():
     if len(sys.argv) != 2:
         print("Usage: validate_semver.py <version>")
         sys.exit(1)
 
-    # From https://semver.org/#is-there-a-suggested-regular-expression-regex-to-check-a-semver-string
-    SEMVER_REGEX = r"^(?P<major>0|[1-9]\d*)\.(?P<minor>0|[1-9]\d*)\.(?P<patch>0|[1-9]\d*)(?:-(?P<prerelease>(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?(?:\+(?P<buildmetadata>[0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?$"
-
-    pattern = re.compile(SEMVER_REGEX)
-
     version = sys.argv[1]
-    match = pattern.search(version)
+    match = SEMVER_RE.fullmatch(version)
 
     # If no match, then return an error (provided version is not valid semver)
     if match is None: